@@ -5,16 +5,33 @@ A command-line tool for exploring Azure Cosmos DB databases and containers.
 """
 
 
+import functools
+import importlib.util
+import itertools
 import json
+import os
+import re
+import shlex
+import socket
+import socketserver
 import sys
-from typing import Optional, Dict, Any, List
+import threading
+import time
+import types
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Dict, Any, Hashable, List, Set, Callable, Iterable, Iterator, Tuple
 import click
-from azure.cosmos import CosmosClient, exceptions
 from rich.console import Console
-from rich.table import Table
-from rich.json import JSON
-from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.text import Text
+
+# The Cosmos SDK (with requests/aiohttp underneath), the heavier Rich
+# renderables, hashlib and concurrent.futures are imported where they're used,
+# so --help and commands served by a daemon don't pay for loading them
+if TYPE_CHECKING:
+    import asyncio
+    from azure.core.pipeline.transport import RequestsTransport
+    from azure.cosmos import ContainerProxy, DatabaseProxy
 
 # Import readline for command history (Unix/Linux/Mac)
 try:
@@ -28,10 +45,25 @@ except ImportError:
     except ImportError:
         READLINE_AVAILABLE = False
 
+# prompt_toolkit adds persistent history and tab completion to interactive
+# mode; like aiohttp it's only imported when actually used
+PROMPT_TOOLKIT_AVAILABLE = importlib.util.find_spec('prompt_toolkit') is not None
+
+# orjson serializes documents for display several times faster than json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# The async SDK needs aiohttp; without it fan-out queries fall back to threads.
+# Only check that it's installed here, CosmosExplorerAsync imports it on connect
+ASYNC_AVAILABLE = importlib.util.find_spec('aiohttp') is not None
+
 console = Console()
 
 # Common User Agent patterns for applications that typically use account keys
-COMMON_USER_AGENTS = {
+COMMON_USER_AGENTS = types.MappingProxyType({k: sys.intern(v) for k, v in {
     "dotnet_web": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
     "node_app": "Mozilla/5.0 (compatible; Node.js)",
     "python_app": "Python-urllib/3.11",
@@ -42,7 +74,212 @@ COMMON_USER_AGENTS = {
     "postman": "PostmanRuntime/7.32.3",
     "curl": "curl/8.4.0",
     "powershell": "Mozilla/5.0 (Windows NT; Windows NT 10.0; en-US) PowerShell/7.3.8"
-}
+}.items()})
+
+# Default to a common web browser (most generic)
+DEFAULT_USER_AGENT = COMMON_USER_AGENTS["dotnet_web"]
+
+# Property paths that can be spliced into a query (identifiers can't be bound as parameters)
+FIELD_PATH_PATTERN = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)*$')
+
+def recent_query(timestamp_field: str, limit: int) -> str:
+    """Build the top-K query used by the recent command.
+    
+    TOP bounds the result server-side, so each partition only returns its
+    first `limit` documents instead of whole pages for the SDK to merge.
+    """
+    if not FIELD_PATH_PATTERN.match(timestamp_field):
+        raise ValueError(f"Invalid timestamp field: {timestamp_field!r}")
+    return f"SELECT TOP {int(limit)} * FROM c ORDER BY c.{timestamp_field} DESC"
+
+def coerce_param_value(value: str) -> Any:
+    """Read a parameter value as JSON (42, true, null, [1, 2], "42"), else keep it as a string."""
+    def reject(constant: str):
+        raise ValueError(constant)  # NaN/Infinity aren't JSON values Cosmos DB accepts
+    
+    try:
+        return json.loads(value, parse_constant=reject)
+    except ValueError:
+        return value
+
+def parse_query_params(pairs: Iterable[str]) -> List[Dict[str, Any]]:
+    """Turn name=value pairs into Cosmos DB query parameters (@name bindings).
+    
+    Cosmos DB compares types strictly, so values are coerced with
+    coerce_param_value: 'age=42' binds a number and 'id="42"' a string.
+    """
+    parameters = []
+    for pair in pairs:
+        name, sep, value = pair.partition('=')
+        name = name.strip().lstrip('@')
+        if not sep or not name.isidentifier():
+            raise ValueError(f"Expected name=value, got {pair!r}")
+        parameters.append({'name': f'@{name}', 'value': coerce_param_value(value)})
+    return parameters
+
+# Clauses whose semantics span partitions, so per-range results can't simply be concatenated
+CROSS_PARTITION_CLAUSES = re.compile(
+    r'\b(ORDER\s+BY|GROUP\s+BY|TOP|OFFSET|LIMIT|DISTINCT|COUNT|SUM|AVG|MIN|MAX)\b', re.IGNORECASE
+)
+
+def can_split_by_feed_range(query: str) -> bool:
+    """Whether a query's results are just the union of its per-partition results."""
+    return not CROSS_PARTITION_CLAUSES.search(query)
+
+# Raised by query_feed_range when a query is no longer confined to its feed range
+FEED_RANGE_SCOPE_ERROR = ("Cosmos DB needed a query plan for a feed range, which would run it over "
+                          "the whole container; run without --parallel")
+
+def used_query_plan(pages: Any) -> bool:
+    """Whether an SDK page iterator switched to a query plan after the gateway refused the query.
+    
+    That path (the SDK's cross-partition aggregator) drops the feed_range, so
+    each range would return results for the whole container.
+    """
+    return getattr(getattr(pages, '_ex_context', None), '_fetched_query_plan', False)
+
+def field_sort_key(item: Dict[str, Any], field_path: str) -> Tuple[int, Any]:
+    """Sort key for a dotted property path, ordered across types like Cosmos DB's ORDER BY.
+    
+    Ascending, that's undefined < null < booleans < numbers < strings < arrays
+    < objects, so documents missing the field sort last in descending order.
+    Arrays and objects only rank by type.
+    """
+    value: Any = item
+    for part in field_path.split('.'):
+        if not isinstance(value, dict) or part not in value:
+            return (0, None)
+        value = value[part]
+    if value is None:
+        return (1, None)
+    if isinstance(value, bool):
+        return (2, value)
+    if isinstance(value, (int, float)):
+        return (3, value)
+    if isinstance(value, str):
+        return (4, value)
+    return (5, None) if isinstance(value, list) else (6, None)
+
+# Documents above this size (indented JSON) skip the pretty-printed panel
+LARGE_ITEM_BYTES = 64 * 1024
+
+# Result sets longer than this are shown through the pager on a terminal
+PAGER_ITEM_COUNT = 50
+
+def dump_json(data: Any, indent: bool = False) -> str:
+    """Serialize a document for display, with orjson when it's installed."""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+        except TypeError:
+            pass  # e.g. integers wider than 64 bits, which json can still encode
+    if indent:
+        return json.dumps(data, indent=2, default=str, ensure_ascii=False)
+    return json.dumps(data, default=str, ensure_ascii=False, separators=(',', ':'))
+
+def highlight_json(json_str: str) -> Text:
+    """Colour already-serialized JSON like rich.json.JSON, without parsing it again."""
+    from rich.highlighter import JSONHighlighter
+    json_text = JSONHighlighter()(json_str)
+    json_text.no_wrap = True
+    json_text.overflow = None
+    return json_text
+
+# Sized for the concurrent fan-out in display_databases/display_containers
+CONNECTION_POOL_SIZE = 64
+
+# aiohttp's 15s default drops idle connections between interactive commands
+KEEPALIVE_TIMEOUT = 60  # seconds
+
+# How long a database's container listing is reused before it's fetched again
+CONTAINER_CACHE_TTL = 5 * 60  # seconds
+
+class TTLCache:
+    """Thread-safe LRU mapping whose entries expire ttl seconds after being stored."""
+    
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: 'OrderedDict[Hashable, Tuple[float, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return entry[1]
+    
+    def __setitem__(self, key: Hashable, value: Any):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+# How long, and how many, query results are kept for repeated queries
+QUERY_CACHE_TTL = 60  # seconds
+QUERY_CACHE_SIZE = 128
+
+def query_cache_key(database_id: str, container_id: str, query: str, max_items: int,
+                    parameters: Optional[List[Dict[str, Any]]] = None) -> bytes:
+    """Digest identifying a query's results: exact query text plus bound parameter values."""
+    import hashlib
+    payload = json.dumps([database_id, container_id, max_items, query, parameters], default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).digest()
+
+def build_transport(pool_size: int = CONNECTION_POOL_SIZE) -> 'RequestsTransport':
+    """Build an HTTP transport whose connection pool can serve concurrent requests."""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from azure.core.pipeline.transport import RequestsTransport
+    
+    session = requests.Session()
+    # Retries are handled by the Cosmos SDK's own retry policies
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    session.mount("https://", adapter)
+    return RequestsTransport(session=session, session_owner=False)
+
+class _OrjsonModule:
+    """Stands in for the json module where the SDK decodes response bodies."""
+    
+    def __getattr__(self, name: str):
+        return getattr(json, name)
+    
+    @staticmethod
+    def loads(data, **kwargs):
+        if not kwargs:
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                pass  # e.g. NaN, which json accepts
+        return json.loads(data, **kwargs)
+
+# The SDK modules that turn each HTTP response body into Python objects
+SDK_RESPONSE_MODULES = ('azure.cosmos._synchronized_request', 'azure.cosmos.aio._asynchronous_request')
+
+def use_orjson_for_responses():
+    """Have the SDK decode response bodies with orjson, if it's installed.
+    
+    Every document a query returns passes through this json.loads call, so it
+    dominates CPU time on large result sets. Integers beyond 64 bits come back
+    as floats, which is how Cosmos DB stores such numbers anyway.
+    """
+    if not ORJSON_AVAILABLE:
+        return
+    for name in SDK_RESPONSE_MODULES:
+        module = sys.modules.get(name)
+        # Leave SDK versions that decode responses some other way alone
+        if module is not None and getattr(module, 'json', None) is json:
+            module.json = _OrjsonModule()
 
 class CosmosExplorer:
     def __init__(self, endpoint: str, key: str, user_agent: Optional[str] = None):
@@ -51,9 +288,33 @@ class CosmosExplorer:
         self.key = key
         self.client = None
         self.user_agent = user_agent
+        self._transport: Optional['RequestsTransport'] = None
+        self._db_proxies: Dict[str, 'DatabaseProxy'] = {}
+        self._container_proxies: Dict[Tuple[str, str], 'ContainerProxy'] = {}
+        self._container_cache = TTLCache(maxsize=256, ttl=CONTAINER_CACHE_TTL)
+        self._query_cache = TTLCache(maxsize=QUERY_CACHE_SIZE, ttl=QUERY_CACHE_TTL)
+        self._loop: Optional['asyncio.AbstractEventLoop'] = None
+        self._async_explorer: Optional['CosmosExplorerAsync'] = None
+        # Set once the async client has failed to start; fan-out then stays on threads
+        self._async_failed = False
+        self._loop_lock = threading.Lock()
         
     def connect(self) -> bool:
         """Establish connection to Cosmos DB."""
+        from azure.cosmos import CosmosClient, exceptions
+        use_orjson_for_responses()
+        
+        # Cached proxies and the async client belong to the previous connection
+        self._db_proxies.clear()
+        self._container_proxies.clear()
+        self._async_failed = False
+        self.clear_cache()
+        self.close()
+        
+        # Keep one transport (and its pooled connections) across reconnects
+        if self._transport is None:
+            self._transport = build_transport()
+        
         try:
             if self.user_agent:
                 # Try to set user agent via user_agent parameter (newer SDK versions)
@@ -61,17 +322,18 @@ class CosmosExplorer:
                     self.client = CosmosClient(
                         self.endpoint, 
                         self.key,
-                        user_agent=self.user_agent
+                        user_agent=self.user_agent,
+                        transport=self._transport
                     )
                 except TypeError:
                     # Fallback: if user_agent parameter doesn't exist, use default client
                     # and modify headers at request level (we'll handle this in individual methods)
-                    self.client = CosmosClient(self.endpoint, self.key)
+                    self.client = CosmosClient(self.endpoint, self.key, transport=self._transport)
             else:
-                self.client = CosmosClient(self.endpoint, self.key)
+                self.client = CosmosClient(self.endpoint, self.key, transport=self._transport)
                 
-            # Test connection by listing databases
-            list(self.client.list_databases())
+            # No probe query needed: constructing the client already reads the
+            # database account, so bad endpoints or keys fail right here
             console.print("[green]✓ Connected to Cosmos DB successfully[/green]")
             return True
         except exceptions.CosmosHttpResponseError as e:
@@ -81,273 +343,834 @@ class CosmosExplorer:
             console.print(f"[red]✗ Connection failed: {str(e)}[/red]")
             return False
     
+    def close(self):
+        """Close the async client and event loop used for fan-out, if any were opened."""
+        if self._loop is None:
+            return
+        if self._async_explorer is not None:
+            self._loop.run_until_complete(self._async_explorer.close())
+            self._async_explorer = None
+        self._loop.close()
+        self._loop = None
+    
+    def clear_cache(self, queries: bool = True):
+        """Forget cached container listings and, unless queries is False, query results."""
+        self._container_cache.clear()
+        if queries:
+            self._query_cache.clear()
+    
+    def fan_out(self, method: str, keys: Iterable[Hashable], *args,
+                on_done: Optional[Callable[[], None]] = None, max_workers: int = 32) -> Dict[Any, Any]:
+        """Call method(*args, key) for every key concurrently; results keyed by key.
+        
+        With aiohttp installed the calls run on the async SDK, on an event loop
+        kept for the life of the explorer so interactive commands share its
+        connection pool. Otherwise, or while another thread (a daemon request)
+        is using the loop, they run on the module-level thread pool. If the
+        async client can't start, that's reported once and not retried until
+        the next connect().
+        """
+        if (ASYNC_AVAILABLE and self.client and not self._async_failed
+                and self._loop_lock.acquire(blocking=False)):
+            import asyncio
+            try:
+                if self._loop is None:
+                    self._loop = asyncio.new_event_loop()
+                if self._async_explorer is None:
+                    async_explorer = CosmosExplorerAsync(self.endpoint, self.key, self.user_agent,
+                                                         self._container_cache)
+                    if self._loop.run_until_complete(async_explorer.connect()):
+                        self._async_explorer = async_explorer
+                    else:
+                        self._async_failed = True
+                        console.print(f"[dim]Async client unavailable ({async_explorer.connect_error}); "
+                                      "using threads instead[/dim]")
+                if self._async_explorer is not None:
+                    return self._loop.run_until_complete(
+                        self._async_explorer.gather(method, keys, *args, on_done=on_done, max_workers=max_workers)
+                    )
+            finally:
+                self._loop_lock.release()
+        return fan_out(lambda key: getattr(self, method)(*args, key), keys, on_done, max_workers)
+    
+    def _db(self, database_id: str) -> 'DatabaseProxy':
+        """Return a cached database proxy, creating it on first use."""
+        proxy = self._db_proxies.get(database_id)
+        if proxy is None:
+            proxy = self._db_proxies.setdefault(database_id, self.client.get_database_client(database_id))
+        return proxy
+    
+    def _container(self, database_id: str, container_id: str) -> 'ContainerProxy':
+        """Return a cached container proxy, creating it on first use."""
+        key = (database_id, container_id)
+        proxy = self._container_proxies.get(key)
+        if proxy is None:
+            proxy = self._container_proxies.setdefault(
+                key, self._db(database_id).get_container_client(container_id)
+            )
+        return proxy
+    
     def list_databases(self) -> List[Dict[str, Any]]:
-        """List all databases in the account."""
+        """List all databases in the account, as the SDK's resource dicts (id, _rid, ...)."""
+        from azure.cosmos import exceptions
+        
         if not self.client:
             console.print("[red]Not connected to Cosmos DB[/red]")
             return []
             
         try:
-            databases = []
-            for db in self.client.list_databases():
-                databases.append({
-                    'id': db['id'],
-                    'self_link': db.get('_self', ''),
-                    'resource_id': db.get('_rid', '')
-                })
-            return databases
+            return list(self.client.list_databases())
         except exceptions.CosmosHttpResponseError as e:
             console.print(f"[red]Error listing databases: {e.message}[/red]")
             return []
     
-    def list_containers(self, database_id: str) -> List[Dict[str, Any]]:
-        """List all containers in a database."""
+    def list_containers(self, database_id: str, use_cache: bool = True) -> List[Dict[str, Any]]:
+        """List all containers in a database, as the SDK's resource dicts (id, partitionKey, _rid, ...).
+        
+        Listings are reused for CONTAINER_CACHE_TTL seconds, so repeated
+        commands in interactive mode don't re-read container metadata.
+        Without use_cache the listing is read again (and the cache refreshed).
+        """
+        from azure.cosmos import exceptions
+        
         if not self.client:
             console.print("[red]Not connected to Cosmos DB[/red]")
             return []
+        
+        containers = self._container_cache.get(database_id) if use_cache else None
+        if containers is not None:
+            return containers
             
         try:
-            database = self.client.get_database_client(database_id)
-            containers = []
-            for container in database.list_containers():
-                containers.append({
-                    'id': container['id'],
-                    'partition_key': container.get('partitionKey', {}),
-                    'self_link': container.get('_self', ''),
-                    'resource_id': container.get('_rid', '')
-                })
+            containers = list(self._db(database_id).list_containers())
+            self._container_cache[database_id] = containers
             return containers
         except exceptions.CosmosHttpResponseError as e:
             console.print(f"[red]Error listing containers: {e.message}[/red]")
             return []
     
     def query_items(self, database_id: str, container_id: str, query: str, 
-                   max_items: int = 100) -> List[Dict[str, Any]]:
-        """Execute a query against a container."""
+                   max_items: int = 100,
+                   parameters: Optional[List[Dict[str, Any]]] = None,
+                   max_concurrency: int = 0,
+                   use_cache: bool = False,
+                   page_size: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Execute a query against a container, yielding at most max_items results.
+        
+        Results are streamed from the SDK's paged iterator, so pages beyond
+        what the caller consumes are never fetched. With max_concurrency > 1
+        the query runs per feed range in parallel instead (see
+        query_by_feed_range); only use that for queries that
+        can_split_by_feed_range accepts. page_size sets how many documents
+        each response carries (default: max_items, up to 100).
+        
+        With use_cache, results read to the end are kept for QUERY_CACHE_TTL
+        seconds and an identical query (text, parameters, container and
+        max_items) is answered from memory without a request.
+        """
+        from azure.cosmos import exceptions
+        
         if not self.client:
             console.print("[red]Not connected to Cosmos DB[/red]")
-            return []
+            return
+        
+        cache_key = query_cache_key(database_id, container_id, query, max_items, parameters) if use_cache else None
+        if cache_key is not None:
+            cached = self._query_cache.get(cache_key)
+            if cached is not None:
+                yield from cached
+                return
+        
+        if max_concurrency > 1:
+            per_range = self.query_by_feed_range(database_id, container_id, query, max_items,
+                                                 parameters, max_concurrency, page_size)
+            if per_range is None:
+                return
+            items = list(itertools.islice(itertools.chain.from_iterable(per_range), max_items))
+            if cache_key is not None:
+                self._query_cache[cache_key] = items
+            yield from items
+            return
             
         try:
-            database = self.client.get_database_client(database_id)
-            container = database.get_container_client(container_id)
+            container = self._container(database_id, container_id)
             
-            items = []
             query_results = container.query_items(
                 query=query,
+                parameters=parameters,
                 enable_cross_partition_query=True,
-                max_item_count=max_items
+                max_item_count=page_size or min(max_items, 100)  # Page size hint
             )
             
-            # Convert iterator to list
-            for item in query_results:
+            # Only a fully consumed result set is cached, never a partial one
+            items = []
+            for item in itertools.islice(query_results, max_items):
                 items.append(item)
-                if len(items) >= max_items:  # Safety limit
-                    break
-                
-            return items
+                yield item
+            if cache_key is not None:
+                self._query_cache[cache_key] = items
         except exceptions.CosmosHttpResponseError as e:
             console.print(f"[red]Error executing query: {e.message}[/red]")
-            return []
         except Exception as e:
             console.print(f"[red]Error: {str(e)}[/red]")
-            return []
+    
+    def query_by_feed_range(self, database_id: str, container_id: str, query: str,
+                            max_items: Optional[int] = 100,
+                            parameters: Optional[List[Dict[str, Any]]] = None,
+                            max_concurrency: int = 4,
+                            page_size: Optional[int] = None) -> Optional[List[List[Dict[str, Any]]]]:
+        """Run a query once per feed range, up to max_concurrency ranges at a time.
+        
+        The Python SDK has no degree-of-parallelism setting and drains the
+        partitions of a cross-partition query one after another. Scoping a copy
+        of the query to each feed range lets those round-trips overlap. Returns
+        one result list per range, each capped at max_items (None: uncapped),
+        or None on error.
+        
+        Pages within a range still arrive in order, since each page's request
+        carries the previous page's continuation token.
+        """
+        from azure.cosmos import exceptions
+        
+        if not self.client:
+            console.print("[red]Not connected to Cosmos DB[/red]")
+            return None
+            
+        try:
+            container = self._container(database_id, container_id)
+            feed_ranges = list(container.read_feed_ranges())
+        except exceptions.CosmosHttpResponseError as e:
+            console.print(f"[red]Error reading feed ranges: {e.message}[/red]")
+            return None
+        
+        results = self.fan_out('query_feed_range', range(len(feed_ranges)), database_id, container_id,
+                               query, max_items, parameters, page_size, feed_ranges,
+                               max_workers=max_concurrency)
+        for result in results.values():
+            if isinstance(result, exceptions.CosmosHttpResponseError):
+                console.print(f"[red]Error executing query: {result.message}[/red]")
+                return None
+            if isinstance(result, Exception):
+                console.print(f"[red]Error: {str(result)}[/red]")
+                return None
+        return [results[index] for index in range(len(feed_ranges))]
+    
+    def query_feed_range(self, database_id: str, container_id: str, query: str, max_items: Optional[int],
+                         parameters: Optional[List[Dict[str, Any]]], page_size: Optional[int],
+                         feed_ranges: List[Dict[str, Any]], index: int) -> List[Dict[str, Any]]:
+        """Run a query within feed_ranges[index]; SDK errors propagate to fan_out."""
+        pages = self._container(database_id, container_id).query_items(
+            query=query,
+            parameters=parameters,
+            feed_range=feed_ranges[index],
+            max_item_count=page_size or min(max_items or 100, 100)
+        ).by_page()
+        items: List[Dict[str, Any]] = []
+        for page in pages:
+            if used_query_plan(pages):
+                raise RuntimeError(FEED_RANGE_SCOPE_ERROR)
+            items.extend(page)
+            if max_items is not None and len(items) >= max_items:
+                break
+        return items[:max_items]
+    
+    def count_documents(self, database_id: str, container_id: str,
+                        max_concurrency: int = 0) -> Optional[int]:
+        """Count the documents in a container with a single aggregate query.
+        
+        With max_concurrency > 1 each feed range is counted in parallel and
+        the partial counts are summed, including every partial value a range
+        returns across its continuation pages.
+        """
+        from azure.cosmos import exceptions
+        
+        if not self.client:
+            console.print("[red]Not connected to Cosmos DB[/red]")
+            return None
+        
+        if max_concurrency > 1:
+            per_range = self.query_by_feed_range(database_id, container_id, "SELECT VALUE COUNT(1) FROM c",
+                                                 None, max_concurrency=max_concurrency, page_size=-1)
+            if per_range is None:
+                return None
+            return sum(sum(counts) for counts in per_range)
+            
+        try:
+            container = self._container(database_id, container_id)
+            
+            # max_item_count is a page size, not a LIMIT; -1 lets the gateway
+            # return the aggregate in as few pages as possible
+            query_results = container.query_items(
+                query="SELECT VALUE COUNT(1) FROM c",
+                enable_cross_partition_query=True,
+                max_item_count=-1
+            )
+            return next(iter(query_results), 0)
+        except exceptions.CosmosHttpResponseError as e:
+            console.print(f"[red]Error counting documents: {e.message}[/red]")
+            return None
+        except Exception as e:
+            console.print(f"[red]Error: {str(e)}[/red]")
+            return None
     
     def get_item(self, database_id: str, container_id: str, item_id: str, 
                 partition_key: str) -> Optional[Dict[str, Any]]:
         """Get a specific item by ID and partition key."""
+        from azure.cosmos import exceptions
+        
         if not self.client:
             console.print("[red]Not connected to Cosmos DB[/red]")
             return None
             
         try:
-            database = self.client.get_database_client(database_id)
-            container = database.get_container_client(container_id)
+            container = self._container(database_id, container_id)
             
             item = container.read_item(item=item_id, partition_key=partition_key)
             return item
         except exceptions.CosmosResourceNotFoundError:
-            console.print(f"[yellow]Item not found: {item_id}[/yellow]")
+            from rich.markup import escape
+            console.print(f"[yellow]Item not found: {escape(item_id)}[/yellow]")
             return None
         except exceptions.CosmosHttpResponseError as e:
             console.print(f"[red]Error reading item: {e.message}[/red]")
             return None
 
+class CosmosExplorerAsync:
+    """Async counterpart of CosmosExplorer's per-container and per-feed-range calls, used for fan-out."""
+    
+    def __init__(self, endpoint: str, key: str, user_agent: Optional[str] = None,
+                 container_cache: Optional[TTLCache] = None):
+        self.endpoint = endpoint
+        self.key = key
+        self.user_agent = user_agent
+        self.client = None
+        self._session = None
+        self.connect_error: Optional[str] = None
+        # Shared with the owning CosmosExplorer so both see the same listings
+        self._container_cache = container_cache if container_cache is not None else TTLCache(
+            maxsize=256, ttl=CONTAINER_CACHE_TTL)
+        self._db_proxies: Dict[str, Any] = {}
+        self._container_proxies: Dict[Tuple[str, str], Any] = {}
+    
+    async def connect(self) -> bool:
+        """Open the aiohttp session and client; False if the account can't be reached."""
+        import aiohttp
+        from azure.core.pipeline.transport import AioHttpTransport
+        from azure.cosmos.aio import CosmosClient as AsyncCosmosClient
+        use_orjson_for_responses()
+        
+        connector = aiohttp.TCPConnector(limit=CONNECTION_POOL_SIZE, keepalive_timeout=KEEPALIVE_TIMEOUT)
+        self._session = aiohttp.ClientSession(connector=connector)
+        transport = AioHttpTransport(session=self._session, session_owner=False)
+        kwargs = {'user_agent': self.user_agent} if self.user_agent else {}
+        try:
+            self.client = await AsyncCosmosClient(self.endpoint, self.key, transport=transport, **kwargs).__aenter__()
+            return True
+        except Exception as e:
+            self.connect_error = str(e) or type(e).__name__
+            await self.close()
+            return False
+    
+    async def close(self):
+        self._db_proxies.clear()
+        self._container_proxies.clear()
+        if self.client is not None:
+            await self.client.close()
+            self.client = None
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+    
+    def _db(self, database_id: str):
+        """Return a cached async database proxy, creating it on first use."""
+        proxy = self._db_proxies.get(database_id)
+        if proxy is None:
+            proxy = self._db_proxies.setdefault(database_id, self.client.get_database_client(database_id))
+        return proxy
+    
+    def _container(self, database_id: str, container_id: str):
+        """Return a cached async container proxy, creating it on first use."""
+        key = (database_id, container_id)
+        proxy = self._container_proxies.get(key)
+        if proxy is None:
+            proxy = self._container_proxies.setdefault(
+                key, self._db(database_id).get_container_client(container_id)
+            )
+        return proxy
+    
+    async def list_containers(self, database_id: str) -> List[Dict[str, Any]]:
+        """List all containers in a database, through the same cache as CosmosExplorer."""
+        from azure.cosmos import exceptions
+        
+        containers = self._container_cache.get(database_id)
+        if containers is not None:
+            return containers
+        
+        try:
+            database = self._db(database_id)
+            containers = [container async for container in database.list_containers()]
+            self._container_cache[database_id] = containers
+            return containers
+        except exceptions.CosmosHttpResponseError as e:
+            console.print(f"[red]Error listing containers: {e.message}[/red]")
+            return []
+    
+    async def count_documents(self, database_id: str, container_id: str) -> Optional[int]:
+        """Count the documents in a container with a single aggregate query."""
+        from azure.cosmos import exceptions
+        
+        try:
+            container = self._container(database_id, container_id)
+            # The async client enables cross-partition queries implicitly
+            async for document_count in container.query_items(query="SELECT VALUE COUNT(1) FROM c",
+                                                              max_item_count=-1):
+                return document_count
+            return 0
+        except exceptions.CosmosHttpResponseError as e:
+            console.print(f"[red]Error counting documents: {e.message}[/red]")
+            return None
+    
+    async def query_feed_range(self, database_id: str, container_id: str, query: str, max_items: Optional[int],
+                               parameters: Optional[List[Dict[str, Any]]], page_size: Optional[int],
+                               feed_ranges: List[Dict[str, Any]], index: int) -> List[Dict[str, Any]]:
+        """Run a query within feed_ranges[index]; SDK errors propagate to gather."""
+        container = self._container(database_id, container_id)
+        pages = container.query_items(
+            query=query,
+            parameters=parameters,
+            feed_range=feed_ranges[index],
+            max_item_count=page_size or min(max_items or 100, 100)
+        ).by_page()
+        items: List[Dict[str, Any]] = []
+        async for page in pages:
+            if used_query_plan(pages):
+                raise RuntimeError(FEED_RANGE_SCOPE_ERROR)
+            items.extend([item async for item in page])
+            if max_items is not None and len(items) >= max_items:
+                break
+        return items[:max_items]
+    
+    async def gather(self, method: str, keys: Iterable[Hashable], *args,
+                     on_done: Optional[Callable[[], None]] = None, max_workers: int = 32) -> Dict[Any, Any]:
+        """Await method(*args, key) for every key, max_workers at a time, mirroring fan_out's results."""
+        import asyncio
+        
+        func = getattr(self, method)
+        semaphore = asyncio.Semaphore(max_workers)
+        
+        async def run(key):
+            try:
+                async with semaphore:
+                    return key, await func(*args, key)
+            except Exception as e:
+                return key, e
+        
+        results: Dict[Any, Any] = {}
+        for next_done in asyncio.as_completed([run(key) for key in keys]):
+            key, result = await next_done
+            results[key] = result
+            if on_done:
+                on_done()
+        return results
+
+def fan_out(func: Callable[[Any], Any], keys: Iterable[Hashable],
+            on_done: Optional[Callable[[], None]] = None, max_workers: int = 32) -> Dict[Any, Any]:
+    """Call func for every key concurrently and return results keyed by input.
+    
+    The SDK does blocking network I/O, so a thread pool overlaps the round-trips
+    instead of paying for them one after another. A call that raises stores its
+    exception as the result so callers can render a placeholder for that key.
+    on_done runs on the calling thread, once per finished call.
+    """
+    keys = list(keys)
+    results: Dict[Any, Any] = {}
+    if not keys:
+        return results
+    
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(keys))) as executor:
+        futures = {executor.submit(func, key): key for key in keys}
+        for future in as_completed(futures):
+            try:
+                results[futures[future]] = future.result()
+            except Exception as e:
+                results[futures[future]] = e
+            if on_done:
+                on_done()
+    return results
+
+# Column layouts for the listing tables: (header, Column keyword arguments)
+DATABASE_COLUMNS: Tuple[Tuple[str, Dict[str, Any]], ...] = (
+    ("Database ID", {"style": "cyan"}),
+    ("Containers", {"style": "green", "justify": "right"}),
+    ("Resource ID", {"style": "magenta"}),
+)
+CONTAINER_COLUMNS: Tuple[Tuple[str, Dict[str, Any]], ...] = (
+    ("Container ID", {"style": "cyan"}),
+    ("Documents", {"style": "green", "justify": "right"}),
+    ("Partition Key", {"style": "yellow"}),
+    ("Resource ID", {"style": "magenta"}),
+)
+
+def spinner_progress(**kwargs):
+    """Return a spinner-and-description Progress on the console; kwargs go to Progress."""
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+    return Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        console=console,
+        **kwargs
+    )
+
+def new_table(title: str, columns: Iterable[Tuple[str, Dict[str, Any]]]):
+    """Return an empty Table with the given column layout, ready for add_row."""
+    from rich.table import Table
+    table = Table(title=title, show_header=True)
+    for header, options in columns:
+        table.add_column(header, **options)
+    return table
+
 def display_databases(databases: List[Dict[str, Any]], explorer: 'CosmosExplorer'):
     """Display databases in a formatted table with container counts."""
     if not databases:
         console.print("[yellow]No databases found[/yellow]")
         return
         
-    table = Table(title="Cosmos DB Databases", show_header=True)
-    table.add_column("Database ID", style="cyan")
-    table.add_column("Containers", style="green", justify="right")
-    table.add_column("Resource ID", style="magenta")
+    table = new_table("Cosmos DB Databases", DATABASE_COLUMNS)
     
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console
-    ) as progress:
+    # Rows are advanced without an immediate redraw; the auto-refresh
+    # thread repaints at a fixed rate however fast the results arrive
+    with spinner_progress(refresh_per_second=10, transient=True) as progress:
         task = progress.add_task("Getting container counts...", total=len(databases))
-        
-        for db in databases:
-            try:
-                containers = explorer.list_containers(db['id'])
-                container_count = len(containers) if containers else 0
-                table.add_row(db['id'], str(container_count), db['resource_id'])
-            except Exception:
-                # If we can't get container count, show "?"
-                table.add_row(db['id'], "?", db['resource_id'])
-            progress.advance(task)
+        results = explorer.fan_out('list_containers', [db['id'] for db in databases],
+                                   on_done=lambda: progress.update(task, advance=1, refresh=False))
+    
+    # Build every row first and fill the table once the progress display is gone
+    rows: List[Tuple[str, ...]] = []
+    for db in databases:
+        containers = results[db['id']]
+        if isinstance(containers, Exception):
+            # If we can't get container count, show "?"
+            rows.append((db['id'], "?", db.get('_rid', '')))
+        else:
+            container_count = len(containers) if containers else 0
+            rows.append((db['id'], str(container_count), db.get('_rid', '')))
     
+    for row in rows:
+        table.add_row(*row)
     console.print(table)
 
-def display_containers(containers: List[Dict[str, Any]], database_id: str, explorer: 'CosmosExplorer'):
-    """Display containers in a formatted table with document counts."""
+def display_containers(containers: List[Dict[str, Any]], database_id: str, explorer: 'CosmosExplorer',
+                       show_counts: bool = True):
+    """Display containers in a formatted table, with document counts unless disabled."""
     if not containers:
         console.print(f"[yellow]No containers found in database '{database_id}'[/yellow]")
         return
         
-    table = Table(title=f"Containers in '{database_id}'", show_header=True)
-    table.add_column("Container ID", style="cyan")
-    table.add_column("Documents", style="green", justify="right") 
-    table.add_column("Partition Key", style="yellow")
-    table.add_column("Resource ID", style="magenta")
+    columns = CONTAINER_COLUMNS if show_counts else [column for column in CONTAINER_COLUMNS
+                                                     if column[0] != "Documents"]
+    table = new_table(f"Containers in '{database_id}'", columns)
     
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console
-    ) as progress:
-        task = progress.add_task("Counting documents...", total=len(containers))
-        
-        for container in containers:
-            try:
-                # Get document count
-                count_items = explorer.query_items(database_id, container['id'], "SELECT VALUE COUNT(1) FROM c", 1)
-                doc_count = count_items[0] if count_items and len(count_items) > 0 else 0
-                doc_count_str = f"{doc_count:,}" if isinstance(doc_count, int) else "?"
-            except Exception:
-                doc_count_str = "?"
-            
-            partition_key_paths = container['partition_key'].get('paths', [])
-            pk_display = ', '.join(partition_key_paths) if partition_key_paths else 'None'
-            
-            table.add_row(
-                container['id'], 
-                doc_count_str,
-                pk_display, 
-                container['resource_id']
+    results: Dict[str, Any] = {}
+    if show_counts:
+        with spinner_progress(refresh_per_second=10, transient=True) as progress:
+            task = progress.add_task("Counting documents...", total=len(containers))
+            results = explorer.fan_out(
+                'count_documents',
+                [container['id'] for container in containers],
+                database_id,
+                on_done=lambda: progress.update(task, advance=1, refresh=False)
             )
-            progress.advance(task)
     
+    rows: List[Tuple[str, ...]] = []
+    for container in containers:
+        partition_key_paths = container.get('partitionKey', {}).get('paths', [])
+        pk_display = ', '.join(partition_key_paths) if partition_key_paths else 'None'
+        
+        if show_counts:
+            doc_count = results[container['id']]
+            count_display = f"{doc_count:,}" if isinstance(doc_count, int) else "?"
+            rows.append((container['id'], count_display, pk_display, container.get('_rid', '')))
+        else:
+            rows.append((container['id'], pk_display, container.get('_rid', '')))
+    
+    for row in rows:
+        table.add_row(*row)
     console.print(table)
 
-def display_items(items: List[Dict[str, Any]], limit: int = 10):
-    """Display query results."""
+def display_items(items: Iterable[Dict[str, Any]], limit: int = 10, compact: bool = False):
+    """Display the first limit query results; items beyond that are never pulled.
+    
+    Items larger than LARGE_ITEM_BYTES, or every item when compact is set, are
+    printed as single-line highlighted JSON instead of an indented panel.
+    Each item is serialized once, plus a compact copy only for large items.
+    """
+    items = list(itertools.islice(items, limit))
     if not items:
         console.print("[yellow]No items found[/yellow]")
         return
     
-    console.print(f"[green]Found {len(items)} items (showing first {min(limit, len(items))})[/green]")
+    from rich.markup import escape
+    from rich.panel import Panel
     
-    for i, item in enumerate(items[:limit]):
-        panel_title = f"Item {i+1} - ID: {item.get('id', 'Unknown')}"
-        json_obj = JSON(json.dumps(item, indent=2, default=str))
-        console.print(Panel(json_obj, title=panel_title, expand=False))
-        console.print()
+    # Both contexts buffer every print below and write the output in one go
+    paged = len(items) > PAGER_ITEM_COUNT and console.is_terminal
+    with console.pager() if paged else console:
+        console.print(f"[green]Showing {len(items)} items[/green]")
+        for i, item in enumerate(items):
+            # Ids are user data, so keep Rich from reading brackets in them as markup
+            panel_title = f"Item {i+1} - ID: {escape(str(item.get('id', 'Unknown')))}"
+            item_json = dump_json(item, indent=not compact)
+            if not compact and len(item_json) > LARGE_ITEM_BYTES:
+                item_json = dump_json(item)
+                compact_item = True
+            else:
+                compact_item = compact
+            if compact_item:
+                console.print(f"[bold]{panel_title}[/bold]")
+                console.print(highlight_json(item_json), soft_wrap=True)
+            else:
+                console.print(Panel(highlight_json(item_json), title=panel_title, expand=False))
+            console.print()
+
+# Daemon mode: a background process keeps one connected CosmosExplorer and
+# serves its methods over a Unix socket, so later invocations skip client setup
+DAEMON_DIR = Path.home() / '.cosmos-db-explorer'
+DAEMON_IDLE_TIMEOUT = 15 * 60  # seconds
+DAEMON_START_TIMEOUT = 10  # seconds
+DAEMON_METHODS = frozenset({
+    'list_databases', 'list_containers', 'query_items', 'query_by_feed_range',
+    'count_documents', 'get_item', 'clear_cache',
+})
+
+def daemon_available() -> bool:
+    """Whether this platform supports the Unix-socket daemon."""
+    return hasattr(os, 'fork') and hasattr(socket, 'AF_UNIX')
+
+def daemon_socket_path(endpoint: str, key: str, user_agent: str) -> Path:
+    """Socket path for an account and User-Agent.
+    
+    The key is hashed in so credentials can't be mixed up, and the User-Agent
+    so a daemon never sends requests under a different one than was asked for.
+    """
+    import hashlib
+    digest = hashlib.sha256(f"{endpoint}\n{key}\n{user_agent}".encode()).hexdigest()[:16]
+    return DAEMON_DIR / f"daemon-{digest}.sock"
+
+class DaemonClient:
+    """Stand-in for CosmosExplorer that forwards calls to a running daemon."""
+    
+    def __init__(self, socket_path: Path):
+        self.socket_path = socket_path
+    
+    def _request(self, method: str, *args, **kwargs) -> Dict[str, Any]:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(str(self.socket_path))
+            with sock.makefile('rwb') as stream:
+                stream.write(json.dumps({'method': method, 'args': args, 'kwargs': kwargs}, default=str).encode() + b'\n')
+                stream.flush()
+                return json.loads(stream.readline())
+    
+    def _call(self, method: str, *args, **kwargs) -> Any:
+        try:
+            response = self._request(method, *args, **kwargs)
+        except (OSError, ValueError) as e:
+            raise click.ClickException(f"Lost connection to daemon: {e}")
+        # Replay whatever the explorer printed (errors, warnings) in the daemon
+        if response.get('output'):
+            console.print(Text.from_ansi(response['output']), end='')
+        return response.get('result')
+    
+    def fan_out(self, method: str, keys: Iterable[Hashable], *args,
+                on_done: Optional[Callable[[], None]] = None, max_workers: int = 32) -> Dict[Any, Any]:
+        """Same contract as CosmosExplorer.fan_out; each call is a daemon request."""
+        return fan_out(lambda key: self._call(method, *args, key), keys, on_done, max_workers)
+    
+    def __getattr__(self, name: str):
+        if name in DAEMON_METHODS:
+            return functools.partial(self._call, name)
+        raise AttributeError(name)
+    
+    def ping(self) -> bool:
+        """Check whether a daemon is listening on the socket."""
+        try:
+            return self._request('ping').get('result') is True
+        except (OSError, ValueError):
+            return False
+    
+    def stop(self) -> bool:
+        """Ask the daemon to shut down."""
+        try:
+            return self._request('shutdown').get('result') is True
+        except (OSError, ValueError):
+            return False
+
+class _DaemonRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        server = self.server
+        server.last_activity = time.monotonic()
+        request = json.loads(self.rfile.readline())
+        method, args, kwargs = request.get('method'), request.get('args', []), request.get('kwargs', {})
+        
+        if method == 'ping':
+            response = {'result': True}
+        elif method == 'shutdown':
+            server.stop_requested.set()
+            response = {'result': True}
+        elif method in DAEMON_METHODS:
+            # Console capture is per thread, so concurrent requests don't mix output
+            with console.capture() as capture:
+                try:
+                    result = getattr(server.explorer, method)(*args, **kwargs)
+                    if isinstance(result, Iterator):
+                        result = list(result)
+                except Exception as e:
+                    # Still reply, so the client shows the error rather than a dropped connection
+                    console.print(f"[red]Daemon error in {method}: {e}[/red]")
+                    result = None
+            response = {'result': result, 'output': capture.get()}
+        else:
+            response = {'result': None, 'output': f"Unknown daemon method: {method}\n"}
+        
+        self.wfile.write(json.dumps(response, default=str).encode() + b'\n')
+
+class _DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+def serve_daemon(explorer: CosmosExplorer, socket_path: Path, idle_timeout: int = DAEMON_IDLE_TIMEOUT):
+    """Serve explorer calls on socket_path until stopped or idle for idle_timeout seconds."""
+    global console
+    # Render captured output with ANSI styles so clients can replay it in colour
+    console = Console(force_terminal=True)
+    
+    server = _DaemonServer(str(socket_path), _DaemonRequestHandler)
+    os.chmod(socket_path, 0o600)
+    server.explorer = explorer
+    server.last_activity = time.monotonic()
+    server.stop_requested = threading.Event()
+    
+    def watch():
+        while not server.stop_requested.wait(1):
+            if time.monotonic() - server.last_activity > idle_timeout:
+                break
+        server.shutdown()
+    
+    threading.Thread(target=watch, daemon=True).start()
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        socket_path.unlink(missing_ok=True)
 
 # CLI Commands
 @click.group()
 @click.option('--endpoint', required=True, help='Cosmos DB account endpoint URL')
 @click.option('--key', required=True, help='Cosmos DB account key')
 @click.option('--user-agent', help='Custom User-Agent string or preset (dotnet_web, node_app, python_app, azure_function, logic_app, power_bi, azure_databricks, postman, curl, powershell)')
+@click.option('--no-daemon', is_flag=True, help='Connect directly even if a daemon is running for this account')
 @click.pass_context
-def cli(ctx, endpoint: str, key: str, user_agent: Optional[str]):
+def cli(ctx, endpoint: str, key: str, user_agent: Optional[str], no_daemon: bool):
     """Cosmos DB CLI Explorer - Explore your Cosmos DB databases and containers."""
     ctx.ensure_object(dict)
     
     # Handle preset user agents or custom ones
-    if user_agent:
-        if user_agent in COMMON_USER_AGENTS:
-            selected_ua = COMMON_USER_AGENTS[user_agent]
-            console.print(f"[dim]Using preset User-Agent: {user_agent}[/dim]")
-        else:
-            selected_ua = user_agent
-            console.print(f"[dim]Using custom User-Agent: {user_agent}[/dim]")
-    else:
-        # Default to a common web browser (most generic)
-        selected_ua = COMMON_USER_AGENTS["dotnet_web"]
+    selected_ua = COMMON_USER_AGENTS.get(user_agent) or user_agent or DEFAULT_USER_AGENT
+    ctx.obj['socket_path'] = daemon_socket_path(endpoint, key, selected_ua)
+    
+    # The daemon commands only talk to the socket; start connects in the daemon itself
+    if ctx.invoked_subcommand == 'daemon':
+        ctx.obj.update(endpoint=endpoint, key=key, user_agent=selected_ua)
+        return
+    
+    # Reuse a running daemon's connection instead of building a new client
+    if not no_daemon and daemon_available():
+        daemon = DaemonClient(ctx.obj['socket_path'])
+        if ctx.obj['socket_path'].exists() and daemon.ping():
+            console.print("[dim]Using running daemon[/dim]")
+            ctx.obj['explorer'] = daemon
+            return
+    
+    if not user_agent:
         console.print("[dim]Using default User-Agent (dotnet_web)[/dim]")
+    elif user_agent in COMMON_USER_AGENTS:
+        console.print(f"[dim]Using preset User-Agent: {user_agent}[/dim]")
+    else:
+        console.print(f"[dim]Using custom User-Agent: {user_agent}[/dim]")
     
     explorer = CosmosExplorer(endpoint, key, selected_ua)
     
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console
-    ) as progress:
+    with spinner_progress() as progress:
         task = progress.add_task("Connecting to Cosmos DB...", total=None)
         if not explorer.connect():
             sys.exit(1)
         progress.update(task, completed=True)
     
     ctx.obj['explorer'] = explorer
+    ctx.call_on_close(explorer.close)
 
 @cli.command()
 @click.argument('database_id')
 @click.argument('container_id')
-@click.option('--limit', '-l', default=10, help='Number of recent documents to retrieve')
+@click.option('--limit', '-l', default=10, type=click.IntRange(min=1), help='Number of recent documents to retrieve')
 @click.option('--timestamp-field', '-t', default='_ts', help='Field to use for sorting by time (default: _ts)')
+@click.option('--compact', '-c', is_flag=True, help='Print documents as single-line JSON instead of panels')
+@click.option('--parallel', '-p', default=0, type=click.IntRange(min=0), help='Query up to N partitions (feed ranges) concurrently')
 @click.pass_context
-def recent(ctx, database_id: str, container_id: str, limit: int, timestamp_field: str):
-    """Get the most recent documents from a container."""
+def recent(ctx, database_id: str, container_id: str, limit: int, timestamp_field: str, compact: bool,
+           parallel: int):
+    """Get the most recent documents from a container.
+    
+    Ordering by a field other than _ts needs a range (or composite) index on
+    that field, otherwise Cosmos DB rejects or scans the ORDER BY.
+    """
     explorer = ctx.obj['explorer']
     
     # Build query to get most recent documents
-    query = f"SELECT * FROM c ORDER BY c.{timestamp_field} DESC"
+    try:
+        query = recent_query(timestamp_field, limit)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="'--timestamp-field'")
     
     console.print(f"[blue]Getting {limit} most recent documents from {database_id}/{container_id}[/blue]")
     console.print(f"[dim]Ordering by: {timestamp_field} (descending)[/dim]")
     console.print()
     
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console
-    ) as progress:
+    with spinner_progress() as progress:
         task = progress.add_task("Fetching recent documents...", total=None)
-        items = explorer.query_items(database_id, container_id, query, limit)
+        if parallel > 1:
+            # Each range returns its own top-K, or one per partition if it has split
+            # since the ranges were read, so sort them all together
+            per_range = explorer.query_by_feed_range(database_id, container_id, query, limit,
+                                                     max_concurrency=parallel) or []
+            items = sorted(itertools.chain.from_iterable(per_range),
+                           key=lambda item: field_sort_key(item, timestamp_field), reverse=True)[:limit]
+        else:
+            items = list(explorer.query_items(database_id, container_id, query, limit))
         progress.update(task, completed=True)
     
     if items:
         console.print(f"[green]Found {len(items)} recent documents:[/green]")
-        display_items(items, limit)
+        display_items(items, limit, compact)
     else:
         console.print("[yellow]No documents found or container is empty[/yellow]")
 
 @cli.command()
 @click.argument('database_id')
 @click.argument('container_id')
+@click.option('--parallel', '-p', default=0, type=click.IntRange(min=0), help='Count up to N partitions (feed ranges) concurrently')
 @click.pass_context
-def count(ctx, database_id: str, container_id: str):
+def count(ctx, database_id: str, container_id: str, parallel: int):
     """Get the total count of documents in a container."""
     explorer = ctx.obj['explorer']
     
     console.print(f"[blue]Counting documents in {database_id}/{container_id}[/blue]")
     
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console
-    ) as progress:
+    with spinner_progress() as progress:
         task = progress.add_task("Counting documents...", total=None)
-        items = explorer.query_items(database_id, container_id, "SELECT VALUE COUNT(1) FROM c", 1)
+        document_count = explorer.count_documents(database_id, container_id, parallel)
         progress.update(task, completed=True)
     
-    if items and len(items) > 0:
-        document_count = items[0]
+    if document_count is not None:
         if document_count == 0:
             console.print(f"[yellow]📄 Container '{container_id}' is empty (0 documents)[/yellow]")
         else:
@@ -356,57 +1179,85 @@ def count(ctx, database_id: str, container_id: str):
         console.print("[red]❌ Could not retrieve document count[/red]")
 
 @cli.command()
+@click.option('--no-cache', is_flag=True, help="Re-read container listings instead of reusing recent ones (daemon/interactive mode)")
 @click.pass_context
-def databases(ctx):
+def databases(ctx, no_cache: bool):
     """List all databases in the account."""
     explorer = ctx.obj['explorer']
+    if no_cache:
+        explorer.clear_cache(queries=False)
     dbs = explorer.list_databases()
     display_databases(dbs, explorer)
 
 @cli.command()
 @click.argument('database_id')
+@click.option('--no-counts', is_flag=True, help='Skip the per-container document count (one COUNT query per container)')
+@click.option('--no-cache', is_flag=True, help="Re-read the container listing instead of reusing a recent one (daemon/interactive mode)")
 @click.pass_context
-def containers(ctx, database_id: str):
+def containers(ctx, database_id: str, no_counts: bool, no_cache: bool):
     """List all containers in a database."""
     explorer = ctx.obj['explorer']
-    containers_list = explorer.list_containers(database_id)
-    display_containers(containers_list, database_id, explorer)
+    containers_list = explorer.list_containers(database_id, use_cache=not no_cache)
+    display_containers(containers_list, database_id, explorer, show_counts=not no_counts)
 
 @cli.command()
 @click.argument('database_id')
 @click.argument('container_id')
 @click.option('--query', '-q', help='Custom SQL query to execute')
-@click.option('--limit', '-l', default=10, help='Maximum number of items to display')
-@click.option('--max-items', default=10, help='Maximum number of items to fetch from Cosmos DB')
-@click.option('--all', '-a', is_flag=True, help='Fetch all documents (overrides --max-items with 1000)')
+@click.option('--limit', '-l', default=10, type=click.IntRange(min=1), help='Maximum number of items to display')
+@click.option('--max-items', default=10, type=click.IntRange(min=1), help='Maximum number of items to fetch from Cosmos DB (never more than --limit)')
+@click.option('--all', '-a', is_flag=True, help='Fetch and display all documents (overrides --max-items and --limit with 1000)')
+@click.option('--param', 'params', multiple=True, metavar='NAME=VALUE',
+              help='Bind @NAME in the query to VALUE, read as JSON if it parses (42, true, "42") and as a string otherwise (repeatable)')
+@click.option('--compact', '-c', is_flag=True, help='Print documents as single-line JSON instead of panels')
+@click.option('--parallel', '-p', default=0, type=click.IntRange(min=0), help='Query up to N partitions (feed ranges) concurrently')
+@click.option('--no-cache', is_flag=True, help="Don't reuse results of an identical recent query (daemon/interactive mode)")
 @click.pass_context
-def query(ctx, database_id: str, container_id: str, query: str, limit: int, max_items: int, all: bool):
-    """Execute a SQL query against a container. Default: get first 10 documents."""
+def query(ctx, database_id: str, container_id: str, query: str, limit: int, max_items: int, all: bool,
+          params: Tuple[str, ...], compact: bool, parallel: int, no_cache: bool):
+    """Execute a SQL query against a container. Default: get first 10 documents.
+    
+    Pass values with --param instead of formatting them into --query, e.g.
+    --query "SELECT * FROM c WHERE c.status = @status" --param status=active.
+    Cosmos DB then sees the same query text each time and can reuse its plan.
+    """
     explorer = ctx.obj['explorer']
     
     # Handle default query and --all flag
     if not query:
         query = 'SELECT * FROM c'
     
+    try:
+        parameters = parse_query_params(params) or None
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="'--param'")
+    
     if all:
-        max_items = 1000  # Reasonable upper limit to prevent accidents
+        max_items = limit = 1000  # Reasonable upper limit to prevent accidents
         console.print("[yellow]⚠️  Fetching up to 1000 documents[/yellow]")
     
+    # Documents past the display limit would be fetched only to be dropped
+    max_items = min(max_items, limit)
+    
+    if parallel > 1 and not can_split_by_feed_range(query):
+        console.print("[yellow]⚠️  Query uses ORDER BY/TOP/aggregates and can't be split by partition; running serially[/yellow]")
+        parallel = 0
+    
     console.print(f"[blue]Executing query on {database_id}/{container_id}:[/blue]")
     console.print(f"[dim]{query}[/dim]")
-    console.print(f"[dim]Fetching up to {max_items} documents, displaying {limit}[/dim]")
+    if parameters:
+        bindings = ', '.join(f"{p['name']}={json.dumps(p['value'])}" for p in parameters)
+        console.print(f"[dim]Parameters: {bindings}[/dim]")
+    console.print(f"[dim]Fetching up to {max_items} documents[/dim]")
     console.print()
     
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console
-    ) as progress:
+    with spinner_progress() as progress:
         task = progress.add_task("Executing query...", total=None)
-        items = explorer.query_items(database_id, container_id, query, max_items)
+        items = list(explorer.query_items(database_id, container_id, query, max_items, parameters, parallel,
+                                          not no_cache, page_size=max_items))
         progress.update(task, completed=True)
     
-    display_items(items, limit)
+    display_items(items, limit, compact)
 
 @cli.command()
 @click.argument('database_id')
@@ -418,18 +1269,311 @@ def get(ctx, database_id: str, container_id: str, item_id: str, partition_key: s
     """Get a specific item by ID and partition key."""
     explorer = ctx.obj['explorer']
     
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console
-    ) as progress:
+    with spinner_progress() as progress:
         task = progress.add_task("Fetching item...", total=None)
         item = explorer.get_item(database_id, container_id, item_id, partition_key)
         progress.update(task, completed=True)
     
     if item:
-        json_obj = JSON(json.dumps(item, indent=2, default=str))
-        console.print(Panel(json_obj, title=f"Item: {item_id}", expand=False))
+        from rich.markup import escape
+        from rich.panel import Panel
+        console.print(Panel(highlight_json(dump_json(item, indent=True)), title=f"Item: {escape(item_id)}", expand=False))
+
+@cli.group()
+def daemon():
+    """Manage a background process that keeps the Cosmos DB connection open.
+    
+    While a daemon is running for an endpoint/key pair, other commands with
+    the same --endpoint, --key and --user-agent use it instead of connecting
+    themselves.
+    Unix-like systems only.
+    """
+    if not daemon_available():
+        raise click.ClickException("Daemon mode needs Unix domain sockets and fork()")
+
+@daemon.command('start')
+@click.option('--idle-timeout', default=DAEMON_IDLE_TIMEOUT, type=click.IntRange(min=1),
+              help='Stop after this many seconds without requests')
+@click.pass_context
+def daemon_start(ctx, idle_timeout: int):
+    """Start a daemon for this account."""
+    socket_path = ctx.obj['socket_path']
+    
+    if DaemonClient(socket_path).ping():
+        console.print("[yellow]Daemon is already running[/yellow]")
+        return
+    DAEMON_DIR.mkdir(mode=0o700, exist_ok=True)
+    socket_path.unlink(missing_ok=True)  # Left behind by a daemon that died
+    
+    pid = os.fork()
+    if pid == 0:
+        # Detach from the terminal and serve until idle
+        os.setsid()
+        devnull = os.open(os.devnull, os.O_RDWR)
+        for fd in (0, 1, 2):
+            os.dup2(devnull, fd)
+        # Only the daemon connects, so the client and its sockets are never shared across fork()
+        explorer = CosmosExplorer(ctx.obj['endpoint'], ctx.obj['key'], ctx.obj['user_agent'])
+        if not explorer.connect():
+            os._exit(1)
+        serve_daemon(explorer, socket_path, idle_timeout)
+        os._exit(0)
+    
+    deadline = time.monotonic() + DAEMON_START_TIMEOUT
+    while time.monotonic() < deadline:
+        if DaemonClient(socket_path).ping():
+            console.print(f"[green]✓ Daemon started (pid {pid}), stops after {idle_timeout}s idle[/green]")
+            return
+        if os.waitpid(pid, os.WNOHANG)[0]:
+            console.print("[red]✗ Daemon could not connect to Cosmos DB[/red]")
+            sys.exit(1)
+        time.sleep(0.1)
+    console.print("[red]✗ Daemon did not start[/red]")
+    sys.exit(1)
+
+@daemon.command('stop')
+@click.pass_context
+def daemon_stop(ctx):
+    """Stop the daemon for this account."""
+    if DaemonClient(ctx.obj['socket_path']).stop():
+        console.print("[green]✓ Daemon stopped[/green]")
+    else:
+        console.print("[yellow]No daemon running[/yellow]")
+
+@daemon.command('status')
+@click.pass_context
+def daemon_status(ctx):
+    """Show whether a daemon is running for this account."""
+    if DaemonClient(ctx.obj['socket_path']).ping():
+        console.print(f"[green]Daemon running at {ctx.obj['socket_path']}[/green]")
+    else:
+        console.print("[yellow]No daemon running[/yellow]")
+
+# Shown by the interactive help command
+HELP_TEXT = """
+Available commands:
+  databases                           - List all databases
+  containers <database_id>            - List containers in database
+  count <database_id> <container_id>  - Count documents in container
+  recent <database_id> <container_id> - Get 10 most recent documents
+  query <db> <container> [sql]        - Execute query (default: first 10 documents)
+  query <db> <container> --all        - Get up to 1000 documents
+  get <db> <container> <id> <pk>      - Get specific item
+  cache clear                         - Forget cached query results and container lists
+  history                             - Show command history
+  clear                               - Clear screen
+  help                                - Show this help
+  exit/quit/q                         - Exit interactive mode
+
+Arguments containing spaces can be quoted, e.g. get MyDB MyContainer "item 1" pk
+"""
+
+@functools.cache
+def help_text() -> Text:
+    """HELP_TEXT as a styled Text, built on first use and reused afterwards.
+    
+    A Text is printed as-is, so the [brackets] in the usage lines aren't read
+    as markup and the string isn't re-parsed on every help command.
+    """
+    return Text(HELP_TEXT)
+
+class CommandParseError(Exception):
+    """An interactive command's arguments couldn't be split, e.g. unbalanced quotes."""
+
+def split_args(rest: str) -> List[str]:
+    """Split shell-quoted arguments; raises CommandParseError instead of shlex's ValueError."""
+    try:
+        return shlex.split(rest)
+    except ValueError as e:
+        raise CommandParseError(str(e)) from e
+
+def split_command(rest: str, leading: int) -> Tuple[List[str], str]:
+    """Split off up to `leading` shell-quoted arguments and return them with the raw remainder.
+    
+    The remainder (a SQL query) is kept verbatim so its own quotes survive.
+    Raises CommandParseError on unbalanced quotes, like split_args.
+    """
+    lexer = shlex.shlex(rest, posix=True)
+    lexer.whitespace_split = True
+    arguments = []
+    try:
+        for _ in range(leading):
+            token = lexer.get_token()
+            if token is None:
+                break
+            arguments.append(token)
+    except ValueError as e:
+        raise CommandParseError(str(e)) from e
+    return arguments, lexer.instream.read().strip()
+
+# Interactive mode keeps its command history next to the daemon sockets
+HISTORY_FILE = DAEMON_DIR / 'history'
+
+# Database and container ids seen in this session, offered as tab completions
+INTERACTIVE_NAMES: Set[str] = set()
+
+# Interactive mode handlers: each takes the explorer and the text after the
+# command verb, and returns True to end the session
+def _do_help(explorer: CosmosExplorer, rest: str):
+    console.print(help_text())
+
+def _do_history(explorer: CosmosExplorer, rest: str):
+    if READLINE_AVAILABLE:
+        entries = ((i, readline.get_history_item(i)) for i in range(1, readline.get_current_history_length() + 1))
+        lines = [f"  {i}: {hist_item}" for i, hist_item in entries if hist_item]
+        console.print("[blue]Command History:[/blue]")
+        if not lines:
+            return
+        # One print for the whole history, paged when it won't fit on screen
+        history = '\n'.join(lines)
+        if len(lines) > console.height:
+            with console.pager():
+                console.print(history, markup=False, highlight=False)
+        else:
+            console.print(history, markup=False, highlight=False)
+    else:
+        console.print("[yellow]Command history not available (readline not installed)[/yellow]")
+
+def _do_cache(explorer: CosmosExplorer, rest: str):
+    if rest.strip().lower() == 'clear':
+        explorer.clear_cache()
+        console.print("[green]✓ Cache cleared[/green]")
+    else:
+        console.print("[red]Usage: cache clear[/red]")
+
+def _do_clear(explorer: CosmosExplorer, rest: str):
+    console.clear()
+    console.print("[green]Interactive Cosmos DB Explorer[/green]")
+    console.print("Type 'help' for available commands or 'exit' to quit.")
+    console.print()
+
+def _do_exit(explorer: CosmosExplorer, rest: str):
+    console.print("Goodbye! 👋")
+    return True
+
+def _do_databases(explorer: CosmosExplorer, rest: str):
+    dbs = explorer.list_databases()
+    INTERACTIVE_NAMES.update(db['id'] for db in dbs)
+    display_databases(dbs, explorer)
+
+def _do_containers(explorer: CosmosExplorer, rest: str):
+    parts = split_args(rest)
+    if len(parts) == 1:
+        db_id = parts[0]
+        containers_list = explorer.list_containers(db_id)
+        INTERACTIVE_NAMES.update(container['id'] for container in containers_list)
+        display_containers(containers_list, db_id, explorer)
+    else:
+        console.print("[red]Usage: containers <database_id>[/red]")
+
+def _do_recent(explorer: CosmosExplorer, rest: str):
+    parts = split_args(rest)
+    if len(parts) >= 2:
+        db_id = parts[0]
+        container_id = parts[1]
+        limit = 10
+        
+        # Check if user specified a limit
+        if len(parts) > 2 and parts[2].isdigit():
+            limit = int(parts[2])
+        
+        query = recent_query('_ts', limit)
+        console.print(f"[blue]Getting {limit} most recent documents from {db_id}/{container_id}[/blue]")
+        console.print(f"[dim]Ordering by: _ts (descending)[/dim]")
+        
+        items = list(explorer.query_items(db_id, container_id, query, limit))
+        if items:
+            console.print(f"[green]Found {len(items)} recent documents:[/green]")
+            display_items(items, limit)
+        else:
+            console.print("[yellow]No documents found or container is empty[/yellow]")
+    else:
+        console.print("[red]Usage: recent <database_id> <container_id> \\[limit][/red]")
+        console.print("[dim]Example: recent MyDB MyContainer 5[/dim]")
+
+def _do_count(explorer: CosmosExplorer, rest: str):
+    parts = split_args(rest)
+    if len(parts) == 2:
+        db_id, container_id = parts
+        
+        console.print(f"[blue]Counting documents in {db_id}/{container_id}[/blue]")
+        document_count = explorer.count_documents(db_id, container_id)
+        
+        if document_count is not None:
+            if document_count == 0:
+                console.print(f"[yellow]📄 Container '{container_id}' is empty (0 documents)[/yellow]")
+            else:
+                console.print(f"[green]📄 Container '{container_id}' contains {document_count:,} documents[/green]")
+        else:
+            console.print("[red]❌ Could not retrieve document count[/red]")
+    else:
+        console.print("[red]Usage: count <database_id> <container_id>[/red]")
+
+def _do_query(explorer: CosmosExplorer, rest: str):
+    parts, query_sql = split_command(rest, 2)
+    if len(parts) == 2:
+        db_id, container_id = parts
+        
+        # Check for --all flag before or after the query; otherwise fetch
+        # only the 10 documents displayed
+        if query_sql == '--all' or query_sql.endswith(' --all') or query_sql.startswith('--all '):
+            max_items = 1000
+            query_sql = query_sql.removeprefix('--all').removesuffix('--all').strip()
+            console.print("[yellow]⚠️  Fetching up to 1000 documents[/yellow]")
+        else:
+            max_items = 10
+        
+        # A query typed in quotes is unwrapped; an unquoted one is used as is
+        if query_sql[:1] in ('"', "'") and query_sql[-1:] == query_sql[:1]:
+            try:
+                unquoted = shlex.split(query_sql)
+            except ValueError:
+                unquoted = []  # e.g. "a"b" - keep it as typed
+            if len(unquoted) == 1:
+                query_sql = unquoted[0]
+        
+        # Get custom query if provided (after db and container)
+        if not query_sql:
+            query_sql = 'SELECT * FROM c'
+        
+        console.print(f"[blue]Query: {query_sql}[/blue]")
+        console.print(f"[dim]Fetching up to {max_items} documents[/dim]")
+        items = list(explorer.query_items(db_id, container_id, query_sql, max_items, use_cache=True))
+        display_items(items, max_items)
+    else:
+        console.print("[red]Usage: query <database_id> <container_id> \\[sql_query] \\[--all][/red]")
+        console.print("[dim]Examples:[/dim]")
+        console.print("[dim]  query MyDB MyContainer[/dim]")
+        console.print("[dim]  query MyDB MyContainer --all[/dim]") 
+        console.print("[dim]  query MyDB MyContainer SELECT c.id FROM c[/dim]")
+
+def _do_get(explorer: CosmosExplorer, rest: str):
+    parts = split_args(rest)
+    if len(parts) == 4:
+        db_id, container_id, item_id, pk = parts
+        item = explorer.get_item(db_id, container_id, item_id, pk)
+        if item:
+            from rich.markup import escape
+            from rich.panel import Panel
+            console.print(Panel(highlight_json(dump_json(item, indent=True)), title=f"Item: {escape(item_id)}", expand=False))
+    else:
+        console.print("[red]Usage: get <database_id> <container_id> <item_id> <partition_key>[/red]")
+
+INTERACTIVE_HANDLERS: Dict[str, Callable[[CosmosExplorer, str], Optional[bool]]] = {
+    'databases': _do_databases,
+    'containers': _do_containers,
+    'recent': _do_recent,
+    'count': _do_count,
+    'query': _do_query,
+    'get': _do_get,
+    'help': _do_help,
+    'history': _do_history,
+    'cache': _do_cache,
+    'clear': _do_clear,
+    'exit': _do_exit,
+    'quit': _do_exit,
+    'q': _do_exit,
+}
 
 @cli.command()
 @click.pass_context
@@ -440,7 +1584,22 @@ def interactive(ctx):
     console.print("[green]Interactive Cosmos DB Explorer[/green]")
     console.print("Type 'help' for available commands or 'exit' to quit.")
     
-    if READLINE_AVAILABLE:
+    read_command = input
+    # prompt_toolkit needs a terminal; piped input keeps plain input() for scripting
+    use_prompt_toolkit = PROMPT_TOOLKIT_AVAILABLE and sys.stdin.isatty()
+    if use_prompt_toolkit:
+        from prompt_toolkit import PromptSession
+        from prompt_toolkit.completion import WordCompleter
+        from prompt_toolkit.history import FileHistory
+        
+        DAEMON_DIR.mkdir(mode=0o700, exist_ok=True)
+        # Completions are only computed on Tab, and include ids listed so far
+        completer = WordCompleter(lambda: sorted(INTERACTIVE_HANDLERS) + sorted(INTERACTIVE_NAMES), WORD=True)
+        session = PromptSession(history=FileHistory(str(HISTORY_FILE)), completer=completer,
+                                complete_while_typing=False)
+        read_command = session.prompt
+        console.print("[dim]📝 Command history saved across sessions - Tab completes commands and listed database/container ids[/dim]")
+    elif READLINE_AVAILABLE:
         console.print("[dim]📝 Command history enabled - use ↑/↓ arrows to navigate previous commands[/dim]")
         # Enable command history and auto-completion
         readline.parse_and_bind('tab: complete')
@@ -453,154 +1612,26 @@ def interactive(ctx):
     
     while True:
         try:
-            if READLINE_AVAILABLE:
-                # Use readline for better input handling
-                command = input("cosmos> ").strip()
-            else:
-                # Fallback to basic input
-                command = input("cosmos> ").strip()
+            command = read_command("cosmos> ").strip()
             
             # Skip empty commands
             if not command:
                 continue
-                
-            if command.lower() in ['exit', 'quit', 'q']:
-                console.print("Goodbye! 👋")
-                break
-            elif command.lower() == 'help':
-                console.print("""
-Available commands:
-  databases                           - List all databases
-  containers <database_id>            - List containers in database
-  count <database_id> <container_id>  - Count documents in container
-  recent <database_id> <container_id> - Get 10 most recent documents
-  query <db> <container> [sql]        - Execute query (default: first 10 documents)
-  query <db> <container> --all        - Get up to 1000 documents
-  get <db> <container> <id> <pk>      - Get specific item
-  history                            - Show command history
-  clear                              - Clear screen
-  help                               - Show this help
-  exit/quit/q                        - Exit interactive mode
-                """)
-            elif command.lower() == 'history':
-                if READLINE_AVAILABLE:
-                    console.print("[blue]Command History:[/blue]")
-                    for i in range(1, readline.get_current_history_length() + 1):
-                        hist_item = readline.get_history_item(i)
-                        if hist_item:
-                            console.print(f"  {i}: {hist_item}")
-                else:
-                    console.print("[yellow]Command history not available (readline not installed)[/yellow]")
-            elif command.lower() == 'clear':
-                import os
-                os.system('cls' if os.name == 'nt' else 'clear')
-                console.print("[green]Interactive Cosmos DB Explorer[/green]")
-                console.print("Type 'help' for available commands or 'exit' to quit.")
-                console.print()
-            elif command.lower() == 'databases':
-                dbs = explorer.list_databases()
-                display_databases(dbs, explorer)
-            elif command.startswith('recent '):
-            elif command.startswith('recent '):
-            elif command.lower() == 'databases':
-                dbs = explorer.list_databases()
-                display_databases(dbs)
-            elif command.startswith('containers '):
-                parts = command.split(' ', 1)
-                if len(parts) == 2:
-                    db_id = parts[1].strip()
-                    containers_list = explorer.list_containers(db_id)
-                    display_containers(containers_list, db_id, explorer)
-                else:
-                    console.print("[red]Usage: containers <database_id>[/red]")
-            elif command.startswith('recent '):
-                parts = command.split(' ')
-                if len(parts) >= 3:
-                    db_id = parts[1]
-                    container_id = parts[2]
-                    limit = 10
-                    
-                    # Check if user specified a limit
-                    if len(parts) > 3 and parts[3].isdigit():
-                        limit = int(parts[3])
-                    
-                    query = "SELECT * FROM c ORDER BY c._ts DESC"
-                    console.print(f"[blue]Getting {limit} most recent documents from {db_id}/{container_id}[/blue]")
-                    console.print(f"[dim]Ordering by: _ts (descending)[/dim]")
-                    
-                    items = explorer.query_items(db_id, container_id, query, limit)
-                    if items:
-                        console.print(f"[green]Found {len(items)} recent documents:[/green]")
-                        display_items(items, limit)
-                    else:
-                        console.print("[yellow]No documents found or container is empty[/yellow]")
-                else:
-                    console.print("[red]Usage: recent <database_id> <container_id> [limit][/red]")
-                    console.print("[dim]Example: recent MyDB MyContainer 5[/dim]")
-            elif command.startswith('count '):
-                parts = command.split(' ')
-                if len(parts) == 3:
-                    db_id = parts[1]
-                    container_id = parts[2]
-                    
-                    console.print(f"[blue]Counting documents in {db_id}/{container_id}[/blue]")
-                    items = explorer.query_items(db_id, container_id, "SELECT VALUE COUNT(1) FROM c", 1)
-                    
-                    if items and len(items) > 0:
-                        document_count = items[0]
-                        if document_count == 0:
-                            console.print(f"[yellow]📄 Container '{container_id}' is empty (0 documents)[/yellow]")
-                        else:
-                            console.print(f"[green]📄 Container '{container_id}' contains {document_count:,} documents[/green]")
-                    else:
-                        console.print("[red]❌ Could not retrieve document count[/red]")
-                else:
-                    console.print("[red]Usage: count <database_id> <container_id>[/red]")
-            elif command.startswith('query '):
-                parts = command.split(' ')
-                if len(parts) >= 3:
-                    db_id = parts[1]
-                    container_id = parts[2]
-                    
-                    # Check for --all flag
-                    if '--all' in parts:
-                        max_items = 1000
-                        # Remove --all from parts for query parsing
-                        parts = [p for p in parts if p != '--all']
-                        console.print("[yellow]⚠️  Fetching up to 1000 documents[/yellow]")
-                    else:
-                        max_items = 10
-                    
-                    # Get custom query if provided (after db and container)
-                    if len(parts) > 3:
-                        query_sql = ' '.join(parts[3:])
-                    else:
-                        query_sql = 'SELECT * FROM c'
-                    
-                    console.print(f"[blue]Query: {query_sql}[/blue]")
-                    console.print(f"[dim]Fetching up to {max_items} documents[/dim]")
-                    items = explorer.query_items(db_id, container_id, query_sql, max_items)
-                    display_items(items, 10)  # Always display max 10 in interactive mode
-                else:
-                    console.print("[red]Usage: query <database_id> <container_id> [sql_query] [--all][/red]")
-                    console.print("[dim]Examples:[/dim]")
-                    console.print("[dim]  query MyDB MyContainer[/dim]")
-                    console.print("[dim]  query MyDB MyContainer --all[/dim]") 
-                    console.print("[dim]  query MyDB MyContainer SELECT c.id FROM c[/dim]")
-            elif command.startswith('get '):
-                parts = command.split(' ')
-                if len(parts) == 5:
-                    _, db_id, container_id, item_id, pk = parts
-                    item = explorer.get_item(db_id, container_id, item_id, pk)
-                    if item:
-                        json_obj = JSON(json.dumps(item, indent=2, default=str))
-                        console.print(Panel(json_obj, title=f"Item: {item_id}", expand=False))
-                else:
-                    console.print("[red]Usage: get <database_id> <container_id> <item_id> <partition_key>[/red]")
-            elif command:
+            
+            # The history command reads readline's list, which prompt_toolkit bypasses
+            if use_prompt_toolkit and READLINE_AVAILABLE:
+                readline.add_history(command)
+            
+            verb, _, rest = command.partition(' ')
+            handler = INTERACTIVE_HANDLERS.get(verb.lower())
+            if handler is None:
                 console.print(f"[red]Unknown command: {command}[/red]")
                 console.print("Type 'help' for available commands.")
+            elif handler(explorer, rest):
+                break
             
+        except CommandParseError as e:
+            console.print(f"[red]Could not parse command: {e}[/red]")
         except KeyboardInterrupt:
             console.print("\nGoodbye! 👋")
             break